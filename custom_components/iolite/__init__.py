@@ -1,9 +1,10 @@
 import logging
 import time
+from contextlib import nullcontext
 from datetime import timedelta
-from typing import Any, Dict, Optional
+from typing import Any, ContextManager, Dict, Optional
 
-from aiohttp import ClientSession
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     CONF_CLIENT_ID,
@@ -12,50 +13,138 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_VERIFY_SSL,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import storage
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from iolite_client.client import Client
+from homeassistant.util import slugify
+from iolite_client.entity import Room
 from iolite_client.oauth_handler import AsyncOAuthHandler, AsyncOAuthStorageInterface
 
-from .const import DEFAULT_SCAN_INTERVAL_SECONDS, DOMAIN, STORAGE_KEY, STORAGE_VERSION
+from .client import IoliteClient
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_REFRESHES,
+    DEFAULT_SCAN_INTERVAL_SECONDS,
+    DOMAIN,
+    EVENT_CHANGES,
+    REFRESH_BUDGET_PER_MINUTE,
+    SCHEDULER,
+    SERVICE_GET_SNAPSHOT,
+    SERVICE_REFRESH,
+    SERVICE_START_PROFILING,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    TELEMETRY_BUFFER_SIZE,
+)
+from .profiler import RefreshProfiler
+from .scheduler import IoliteAccount, IoliteScheduler, IoliteTransport
+from .snapshot import build_snapshot, diff_snapshots
+from .telemetry import TelemetryStore
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["climate", "cover", "sensor"]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+START_PROFILING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the IOLITE services."""
+
+    async def async_refresh(call: ServiceCall):
+        for coordinator in get_coordinators(hass):
+            await coordinator.async_request_refresh()
+
+    async def async_get_snapshot(call: ServiceCall) -> ServiceResponse:
+        return {
+            "entries": {
+                coordinator.entry_id: coordinator.get_snapshot()
+                for coordinator in get_coordinators(hass)
+            }
+        }
+
+    async def async_start_profiling(call: ServiceCall):
+        coordinators = get_coordinators(hass)
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            coordinators = [c for c in coordinators if c.entry_id == entry_id]
+        if len(coordinators) != 1:
+            raise HomeAssistantError(
+                f"Set {ATTR_CONFIG_ENTRY_ID} to one loaded IOLITE entry to profile"
+            )
+
+        coordinators[0].async_start_profiling(call.data[ATTR_REFRESHES])
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_refresh)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        async_get_snapshot,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_PROFILING,
+        async_start_profiling,
+        schema=START_PROFILING_SCHEMA,
+    )
+
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up platform from a ConfigEntry."""
     hass.data.setdefault(DOMAIN, {})
     username: str = entry.data[CONF_USERNAME]
     password: str = entry.data[CONF_PASSWORD]
-    client_id: str = entry.data[CONF_CLIENT_ID]
-    scan_interval_seconds: int = entry.data.get(
-        CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_SECONDS
+    scan_interval_seconds = _get_scan_interval_seconds(entry)
+    verify_ssl = _get_verify_ssl(entry)
+
+    scheduler: IoliteScheduler = hass.data[DOMAIN].setdefault(
+        SCHEDULER, IoliteScheduler(REFRESH_BUDGET_PER_MINUTE)
     )
-    verify_ssl: bool = entry.options.get(
-        CONF_VERIFY_SSL, entry.data.get(CONF_VERIFY_SSL, True)
+    account = scheduler.async_get_account(
+        entry.entry_id, username, HaOAuthStorageInterface(hass, username)
     )
 
-    web_session = async_get_clientsession(hass)
-
-    storage = HaOAuthStorageInterface(hass)
     coordinator = IoliteDataUpdateCoordinator(
         hass,
-        web_session,
+        entry.entry_id,
+        account,
+        _create_transport(hass, entry),
+        scheduler,
         username,
         password,
-        storage,
         scan_interval_seconds,
-        client_id,
         verify_ssl,
     )
 
-    await coordinator.async_config_entry_first_refresh()
-    hass.data.setdefault(DOMAIN, {})
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        _async_release_scheduler(hass, entry)
+        raise
+
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -68,10 +157,67 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        _async_release_scheduler(hass, entry)
 
     return unload_ok
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
+    """Apply changed options without reloading the config entry."""
+    coordinator: IoliteDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.update_interval = timedelta(seconds=_get_scan_interval_seconds(entry))
+
+    verify_ssl = _get_verify_ssl(entry)
+    if verify_ssl == coordinator.verify_ssl:
+        return
+
+    _LOGGER.debug(f"Rebuilding transport with verify_ssl={verify_ssl}")
+    coordinator.transport = _create_transport(hass, entry)
+    coordinator.verify_ssl = verify_ssl
+    await coordinator.async_request_refresh()
+
+
+def _get_scan_interval_seconds(entry: ConfigEntry) -> int:
+    return entry.options.get(
+        CONF_SCAN_INTERVAL,
+        entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_SECONDS),
+    )
+
+
+def _get_verify_ssl(entry: ConfigEntry) -> bool:
+    return entry.options.get(CONF_VERIFY_SSL, entry.data.get(CONF_VERIFY_SSL, True))
+
+
+def _create_transport(hass: HomeAssistant, entry: ConfigEntry) -> IoliteTransport:
+    return IoliteTransport(
+        entry.data[CONF_USERNAME],
+        entry.data[CONF_PASSWORD],
+        async_get_clientsession(hass),
+        entry.data[CONF_CLIENT_ID],
+        _get_verify_ssl(entry),
+    )
+
+
+def get_coordinators(hass: HomeAssistant) -> list["IoliteDataUpdateCoordinator"]:
+    """Return the coordinators of all loaded config entries."""
+    return [
+        value
+        for value in hass.data.get(DOMAIN, {}).values()
+        if isinstance(value, IoliteDataUpdateCoordinator)
+    ]
+
+
+def _age(now: float, timestamp: Optional[float]) -> Optional[float]:
+    return None if timestamp is None else round(now - timestamp, 1)
+
+
+def _async_release_scheduler(hass: HomeAssistant, entry: ConfigEntry):
+    scheduler: IoliteScheduler = hass.data[DOMAIN][SCHEDULER]
+    scheduler.async_release(entry.entry_id)
+    if scheduler.is_empty:
+        hass.data[DOMAIN].pop(SCHEDULER)
+
+
 async def get_sid(
     oauth_handler: AsyncOAuthHandler, storage: AsyncOAuthStorageInterface
 ):
@@ -109,11 +255,15 @@ async def refresh_token(
 
 
 class HaOAuthStorageInterface(AsyncOAuthStorageInterface):
-    """Storage abstraction for tokens."""
+    """Storage abstraction for the tokens of an account."""
 
-    def __init__(self, hass: HomeAssistant):
+    def __init__(self, hass: HomeAssistant, username: str):
         """Init."""
-        self.store = storage.Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.store = storage.Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}-{slugify(username)}"
+        )
+        # Tokens used to be stored under a single key for all accounts
+        self.legacy_store = storage.Store(hass, STORAGE_VERSION, STORAGE_KEY)
         super().__init__()
 
     async def store_access_token(self, payload: dict):
@@ -122,7 +272,17 @@ class HaOAuthStorageInterface(AsyncOAuthStorageInterface):
 
     async def fetch_access_token(self) -> Optional[dict]:
         """Fetch access token."""
-        return await self.store.async_load()
+        payload = await self.store.async_load()
+        if payload is not None:
+            return payload
+
+        payload = await self.legacy_store.async_load()
+        if payload is not None:
+            _LOGGER.debug("Migrating access token to account storage")
+            await self.store.async_save(payload)
+            await self.legacy_store.async_remove()
+
+        return payload
 
 
 class IoliteDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
@@ -131,42 +291,153 @@ class IoliteDataUpdateCoordinator(DataUpdateCoordinator[Dict[str, Any]]):
     def __init__(
         self,
         hass: HomeAssistant,
-        web_session: ClientSession,
+        entry_id: str,
+        account: IoliteAccount,
+        transport: IoliteTransport,
+        scheduler: IoliteScheduler,
         username: str,
         password: str,
-        storage: AsyncOAuthStorageInterface,
         scan_interval_seconds: int,
-        client_id: str,
         verify_ssl: bool = True,
     ):
         """Initializer."""
         self.hass = hass
-        self.web_session = web_session
+        self.entry_id = entry_id
+        self.account = account
+        self.transport = transport
+        self.scheduler = scheduler
         self.username = username
         self.password = password
-        self.client_id = client_id
-        self.storage = storage
         self.verify_ssl = verify_ssl
         self.client = None
+        self.updated_at: Optional[float] = None
+        self.snapshot: Optional[dict] = None
+        self.changes: Optional[dict] = None
+        self.profiler: Optional[RefreshProfiler] = None
+        self.telemetry = TelemetryStore(TELEMETRY_BUFFER_SIZE)
 
         update_interval = timedelta(seconds=scan_interval_seconds)
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=update_interval)
 
     async def _async_update_data(self) -> dict[str, Any]:
-        oauth_handler = AsyncOAuthHandler(
+        with self._profile_phase("wait_for_slot"):
+            await self.scheduler.async_wait_for_slot(self.username)
+
+        with self._profile_phase("get_sid"):
+            async with self.account.auth_lock:
+                sid = await get_sid(self.transport.oauth_handler, self.account.storage)
+
+        self.client = IoliteClient(
+            sid,
             self.username,
             self.password,
-            self.web_session,
-            self.client_id,
+            self.transport.ssl_context,
             verify_ssl=self.verify_ssl,
         )
-        sid = await get_sid(oauth_handler, self.storage)
+        with self._profile_phase("async_discover"):
+            await self.client.async_discover()
+
+        with self._profile_phase("build_rooms"):
+            rooms = {}
+            for room in self.client.discovered.get_rooms():
+                rooms[room.identifier] = room
 
-        self.client = Client(sid, self.username, self.password, verify_ssl=self.verify_ssl)
-        await self.client.async_discover()
+        with self._profile_phase("telemetry"):
+            self.telemetry.record(rooms.values(), time.time())
+            self.telemetry.compute()
 
-        rooms = {}
-        for room in self.client.discovered.get_rooms():
-            rooms[room.identifier] = room
+        with self._profile_phase("snapshot"):
+            self._update_snapshot(rooms)
+        self.updated_at = time.monotonic()
 
         return rooms
+
+    def async_start_profiling(self, refreshes: int):
+        """Profile the next refreshes and write the results to a file."""
+        _LOGGER.info(f"Profiling the next {refreshes} refreshes of {self.entry_id}")
+        self.profiler = RefreshProfiler(refreshes)
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        profiler = self.profiler
+        if profiler is None:
+            await super()._async_refresh(*args, **kwargs)
+        else:
+            await self._async_profile_refresh(profiler, *args, **kwargs)
+
+        # Fired once the listeners are updated, so entity states match the event
+        changes, self.changes = self.changes, None
+        if changes:
+            self.hass.bus.async_fire(
+                EVENT_CHANGES, {"entry_id": self.entry_id, **changes}
+            )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        with self._profile_phase("update_listeners"):
+            super().async_update_listeners()
+
+    def _profile_phase(self, name: str) -> ContextManager[None]:
+        profiler = self.profiler
+        if profiler is None or not profiler.is_active:
+            return nullcontext()
+
+        return profiler.phase(name)
+
+    async def _async_profile_refresh(
+        self, profiler: RefreshProfiler, *args: Any, **kwargs: Any
+    ) -> None:
+        """Run a refresh under the profiler.
+
+        Profiler failures disarm profiling, the refresh itself always runs.
+        """
+        try:
+            started = profiler.start()
+        except Exception as e:
+            self._async_disarm_profiler(profiler, e)
+            started = False
+
+        try:
+            await super()._async_refresh(*args, **kwargs)
+        finally:
+            if started:
+                try:
+                    profiler.stop()
+                except Exception as e:
+                    self._async_disarm_profiler(profiler, e)
+
+        if not profiler.is_done or self.profiler is not profiler:
+            return
+
+        self.profiler = None
+        path = self.hass.config.path(
+            f"{DOMAIN}_profile_{self.entry_id}_{int(time.time())}.txt"
+        )
+        try:
+            await self.hass.async_add_executor_job(profiler.write_report, path)
+        except Exception as e:
+            _LOGGER.warning(f"Failed to write refresh profile to {path}: {e}")
+            return
+
+        _LOGGER.info(f"Wrote refresh profile to {path}")
+
+    def _async_disarm_profiler(self, profiler: RefreshProfiler, error: Exception):
+        _LOGGER.warning(f"Profiling failed, disarming it: {error}")
+        profiler.abort()
+        if self.profiler is profiler:
+            self.profiler = None
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """Return the current snapshot along with the age of its data."""
+        now = time.monotonic()
+        snapshot = dict(self.snapshot or {})
+        snapshot["age"] = _age(now, self.updated_at)
+
+        return snapshot
+
+    def _update_snapshot(self, rooms: Dict[str, Room]):
+        """Build a new snapshot and collect the changes to the previous one."""
+        snapshot = build_snapshot(rooms)
+        if self.snapshot is not None:
+            self.changes = diff_snapshots(self.snapshot, snapshot)
+        self.snapshot = snapshot
@@ -0,0 +1,37 @@
+"""IOLITE client with a shared transport."""
+
+import inspect
+import ssl
+
+import websockets
+from iolite_client.client import Client
+
+# websockets renamed the headers argument, resolve it once instead of on every connect
+HEADERS_ARGUMENT = (
+    "extra_headers"
+    if "extra_headers" in inspect.signature(websockets.connect).parameters
+    else "additional_headers"
+)
+
+
+class IoliteClient(Client):
+    """Client connecting its websockets with a pre-built SSL context."""
+
+    def __init__(
+        self,
+        sid: str,
+        username: str,
+        password: str,
+        ssl_context: ssl.SSLContext,
+        verify_ssl: bool = True,
+    ):
+        """Initialize the client."""
+        super().__init__(sid, username, password, verify_ssl=verify_ssl)
+        self.ssl_context = ssl_context
+
+    def _ws_connect(self, uri: str):
+        return websockets.connect(
+            uri,
+            ssl=self.ssl_context,
+            **{HEADERS_ARGUMENT: self._get_default_headers()},
+        )
@@ -9,7 +9,6 @@ from homeassistant.components.climate.const import ClimateEntityFeature
 from homeassistant.const import ATTR_BATTERY_LEVEL, ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from iolite_client.client import Client
 from iolite_client.entity import InFloorValve, RadiatorValve, Room
 
 from . import IoliteDataUpdateCoordinator
@@ -42,13 +41,9 @@ async def async_setup_entry(
     for room in coordinator.data.values():
         for device in room.devices.values():
             if isinstance(device, RadiatorValve):
-                devices.append(
-                    RadiatorValveEntity(coordinator, device, room, coordinator.client)
-                )
+                devices.append(RadiatorValveEntity(coordinator, device, room))
             if isinstance(device, InFloorValve):
-                devices.append(
-                    InFloorValveEntity(coordinator, device, room, coordinator.client)
-                )
+                devices.append(InFloorValveEntity(coordinator, device, room))
 
     for device in devices:
         _LOGGER.info(f"Adding {device}")
@@ -66,11 +61,10 @@ class RadiatorValveEntity(CoordinatorEntity, ClimateEntity):
     _attr_target_temperature_step: float = 0.5
     _attr_supported_features: int = SUPPORT_FLAGS
 
-    def __init__(self, coordinator, valve: RadiatorValve, room: Room, client: Client):
+    def __init__(self, coordinator, valve: RadiatorValve, room: Room):
         """Initialize the valve."""
         super().__init__(coordinator)
         self.valve = valve
-        self.client = client
         self._attr_unique_id = valve.identifier
         self._attr_min_temp = TEMP_MIN
         self._attr_max_temp = TEMP_MAX
@@ -88,7 +82,7 @@ class RadiatorValveEntity(CoordinatorEntity, ClimateEntity):
         if temperature is None:
             return
 
-        await self.client.async_set_property(
+        await self.coordinator.client.async_set_property(
             self.valve.identifier, "heatingTemperatureSetting", temperature
         )
         await self.coordinator.async_request_refresh()
@@ -133,8 +127,9 @@ class RadiatorValveEntity(CoordinatorEntity, ClimateEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
+        valve: RadiatorValve = self.room.devices[self.valve.identifier]
         extra_state_attributes = {
-            ATTR_BATTERY_LEVEL: self.valve.battery_level,
+            ATTR_BATTERY_LEVEL: valve.battery_level,
         }
 
         return extra_state_attributes
@@ -147,11 +142,10 @@ class InFloorValveEntity(CoordinatorEntity, ClimateEntity):
     _attr_target_temperature_step: float = 0.5
     _attr_supported_features: int = SUPPORT_FLAGS
 
-    def __init__(self, coordinator, valve: InFloorValve, room: Room, client: Client):
+    def __init__(self, coordinator, valve: InFloorValve, room: Room):
         """Initialize the valve."""
         super().__init__(coordinator)
         self.valve = valve
-        self.client = client
         self._attr_unique_id = valve.identifier
         self._attr_min_temp = TEMP_MIN
         self._attr_max_temp = TEMP_MAX
@@ -169,7 +163,7 @@ class InFloorValveEntity(CoordinatorEntity, ClimateEntity):
         if temperature is None:
             return
 
-        await self.client.async_set_property(
+        await self.coordinator.client.async_set_property(
             self.valve.identifier, "heatingTemperatureSetting", temperature
         )
         await self.coordinator.async_request_refresh()
@@ -64,7 +64,7 @@ async def validate_and_persist_auth(
         username, password, web_session, client_id, verify_ssl=verify_ssl
     )
     access_token = await oauth_handler.get_access_token(code, name)
-    storage = HaOAuthStorageInterface(hass)
+    storage = HaOAuthStorageInterface(hass, username)
     await storage.store_access_token(access_token)
 
 
@@ -122,21 +122,30 @@ class IoliteOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
+        # Looked up by handler as self.config_entry is not set on older releases
+        config_entry = self.hass.config_entries.async_get_entry(self.handler)
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
                     vol.Required(
-                        CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL_SECONDS
+                        CONF_SCAN_INTERVAL,
+                        default=config_entry.options.get(
+                            CONF_SCAN_INTERVAL,
+                            config_entry.data.get(
+                                CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL_SECONDS
+                            ),
+                        ),
                     ): vol.All(
                         vol.Coerce(int),
                         Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
                     ),
                     vol.Optional(
                         CONF_VERIFY_SSL,
-                        default=self.config_entry.options.get(
+                        default=config_entry.options.get(
                             CONF_VERIFY_SSL,
-                            self.config_entry.data.get(CONF_VERIFY_SSL, True),
+                            config_entry.data.get(CONF_VERIFY_SSL, True),
                         ),
                     ): cv.boolean,
                 }
@@ -6,3 +6,17 @@ DEFAULT_SCAN_INTERVAL_SECONDS = 60
 
 STORAGE_KEY = f"{DOMAIN}-auth"
 STORAGE_VERSION = 1
+
+TELEMETRY_BUFFER_SIZE = 30
+
+SCHEDULER = "scheduler"
+REFRESH_BUDGET_PER_MINUTE = 20
+
+SERVICE_REFRESH = "refresh"
+SERVICE_GET_SNAPSHOT = "get_snapshot"
+SERVICE_START_PROFILING = "start_profiling"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_REFRESHES = "refreshes"
+
+EVENT_CHANGES = f"{DOMAIN}_changes"
@@ -12,7 +12,6 @@ from homeassistant.components.cover import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from iolite_client.client import Client
 from iolite_client.entity import Blind, Room
 
 from . import IoliteDataUpdateCoordinator
@@ -41,9 +40,7 @@ async def async_setup_entry(
     for room in coordinator.data.values():
         for device in room.devices.values():
             if isinstance(device, Blind):
-                devices.append(
-                    BlindEntity(coordinator, device, room, coordinator.client)
-                )
+                devices.append(BlindEntity(coordinator, device, room))
 
     for device in devices:
         _LOGGER.info(f"Adding {device}")
@@ -60,10 +57,9 @@ class BlindEntity(CoordinatorEntity, CoverEntity):
     _attr_current_position: int = COVER_MIN
     _attr_supported_features: int = SUPPORT_FLAGS
 
-    def __init__(self, coordinator, blind: Blind, room: Room, client: Client):
+    def __init__(self, coordinator, blind: Blind, room: Room):
         super().__init__(coordinator)
         self.blind = blind
-        self.client = client
         self._attr_unique_id = blind.identifier
         self._attr_name = f"{self.blind.name} ({room.name})"
         self._attr_device_info = {
@@ -93,7 +89,7 @@ class BlindEntity(CoordinatorEntity, CoverEntity):
         if position is None:
             return
 
-        await self.client.async_set_property(
+        await self.coordinator.client.async_set_property(
             self.blind.identifier, "blindLevel", 100 - position
         )
         await asyncio.sleep(35)
@@ -101,7 +97,7 @@ class BlindEntity(CoordinatorEntity, CoverEntity):
         self.async_write_ha_state()
 
     async def async_close_cover(self, **kwargs):
-        await self.client.async_set_property(
+        await self.coordinator.client.async_set_property(
             self.blind.identifier, "blindLevel", COVER_MAX
         )
         await asyncio.sleep(35)
@@ -109,7 +105,7 @@ class BlindEntity(CoordinatorEntity, CoverEntity):
         self.async_write_ha_state()
 
     async def async_open_cover(self, **kwargs):
-        await self.client.async_set_property(
+        await self.coordinator.client.async_set_property(
             self.blind.identifier, "blindLevel", COVER_MIN
         )
         await asyncio.sleep(35)
@@ -0,0 +1,120 @@
+"""Opt-in profiling of IOLITE coordinator refreshes."""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+PROFILE_STATS_LIMIT = 50
+MEMORY_STATS_LIMIT = 25
+
+# cProfile allows a single active profiler per thread, so only one refresh is
+# profiled at a time across all coordinators.
+_active: Optional["RefreshProfiler"] = None
+
+
+class RefreshProfiler:
+    """Profiles a number of refreshes of a coordinator.
+
+    The profiler runs on the event loop thread, so the CPU profile also
+    contains other work done while a refresh awaits. The phase timings are
+    measured around the coordinator's own steps and are not affected by that.
+    Allocations are only traced while a refresh is profiled.
+    """
+
+    def __init__(self, refreshes: int):
+        """Initialize the profiler."""
+        self.remaining = refreshes
+        self.profile = cProfile.Profile()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self._started_tracemalloc = False
+
+    @property
+    def is_done(self) -> bool:
+        """Return whether all requested refreshes have been profiled."""
+        return self.remaining <= 0
+
+    @property
+    def is_active(self) -> bool:
+        """Return whether a refresh is being profiled."""
+        return _active is self
+
+    def start(self) -> bool:
+        """Start profiling a refresh.
+
+        Returns False when another refresh is already being profiled.
+        """
+        global _active
+        if _active is not None:
+            return False
+
+        self.profile.enable()
+        _active = self
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        return True
+
+    def stop(self):
+        """Stop profiling a refresh."""
+        global _active
+        _active = None
+        self.profile.disable()
+        self.remaining -= 1
+
+        if tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def abort(self):
+        """Stop profiling without collecting the refresh."""
+        global _active
+        if _active is self:
+            _active = None
+            self.profile.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the wall clock time of a refresh phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name].append(time.perf_counter() - start)
+
+    def write_report(self, path: str):
+        """Write the collected statistics to the given path."""
+        report = io.StringIO()
+        report.write("Phase timings (wall clock seconds)\n\n")
+        for name, timings in self.timings.items():
+            report.write(
+                f"{name}: count={len(timings)} total={sum(timings):.4f}"
+                f" max={max(timings):.4f}\n"
+            )
+
+        report.write("\nProfile (sorted by cumulative time)\n\n")
+        try:
+            stats = pstats.Stats(self.profile, stream=report)
+        except TypeError:
+            report.write("No profile data collected\n")
+        else:
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_STATS_LIMIT)
+
+        if self.snapshot:
+            report.write("\nMemory allocations of the last refresh (top by size)\n\n")
+            for stat in self.snapshot.statistics("lineno")[:MEMORY_STATS_LIMIT]:
+                report.write(f"{stat}\n")
+
+        with open(path, "w") as file:
+            file.write(report.getvalue())
@@ -0,0 +1,104 @@
+"""Integration-wide refresh scheduling for IOLITE."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Set
+
+from aiohttp import ClientSession
+from homeassistant.util.ssl import get_default_context, get_default_no_verify_context
+from iolite_client.oauth_handler import AsyncOAuthHandler, AsyncOAuthStorageInterface
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IoliteTransport:
+    """Auth handler and SSL context used by a config entry."""
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        web_session: ClientSession,
+        client_id: str,
+        verify_ssl: bool = True,
+    ):
+        """Initialize the transport."""
+        self.oauth_handler = AsyncOAuthHandler(
+            username,
+            password,
+            web_session,
+            client_id,
+            verify_ssl=verify_ssl,
+        )
+        # Shared contexts built by Home Assistant outside the event loop
+        self.ssl_context = (
+            get_default_context() if verify_ssl else get_default_no_verify_context()
+        )
+
+
+class IoliteAccount:
+    """Token storage and auth lock shared by all entries of the same account."""
+
+    def __init__(self, storage: AsyncOAuthStorageInterface):
+        """Initialize the account."""
+        self.storage = storage
+        self.auth_lock = asyncio.Lock()
+        self.entry_ids: Set[str] = set()
+
+
+class IoliteScheduler:
+    """Spreads coordinator refreshes across config entries.
+
+    Refreshes of all entries are started at least ``min_spacing`` seconds
+    apart, which both staggers polls that would otherwise line up and caps
+    the overall number of refreshes per minute.
+    """
+
+    def __init__(self, refresh_budget_per_minute: int):
+        """Initialize the scheduler."""
+        self.min_spacing = 60 / refresh_budget_per_minute
+        self.accounts: Dict[str, IoliteAccount] = {}
+        self._lock = asyncio.Lock()
+        self._last_start = 0.0
+
+    def async_get_account(
+        self,
+        entry_id: str,
+        username: str,
+        storage: AsyncOAuthStorageInterface,
+    ) -> IoliteAccount:
+        """Return the shared account for the given username.
+
+        The storage is only used when the account is not known yet.
+        """
+        account = self.accounts.get(username)
+        if account is None:
+            account = IoliteAccount(storage)
+            self.accounts[username] = account
+
+        account.entry_ids.add(entry_id)
+
+        return account
+
+    def async_release(self, entry_id: str):
+        """Release the resources held for the given config entry."""
+        for key, account in list(self.accounts.items()):
+            account.entry_ids.discard(entry_id)
+            if not account.entry_ids:
+                self.accounts.pop(key)
+
+    @property
+    def is_empty(self) -> bool:
+        """Return whether no config entries use the scheduler."""
+        return not self.accounts
+
+    async def async_wait_for_slot(self, name: str):
+        """Wait until a refresh may start without exceeding the budget."""
+        async with self._lock:
+            delay = self._last_start + self.min_spacing - time.monotonic()
+            if delay > 0:
+                _LOGGER.debug(f"Delaying refresh of {name} by {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+            self._last_start = time.monotonic()
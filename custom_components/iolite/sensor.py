@@ -8,10 +8,16 @@ from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
+from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from iolite_client.entity import HumiditySensor, Room
+from iolite_client.entity import (
+    Device,
+    HumiditySensor,
+    InFloorValve,
+    RadiatorValve,
+    Room,
+)
 
 from . import IoliteDataUpdateCoordinator
 from .const import DOMAIN
@@ -38,6 +44,13 @@ async def async_setup_entry(
                 devices.append(
                     HumidityTemperatureSensorEntity(coordinator, device, room)
                 )
+                devices.append(AverageHumiditySensorEntity(coordinator, device, room))
+            if isinstance(device, (HumiditySensor, RadiatorValve, InFloorValve)):
+                devices.append(TemperatureTrendSensorEntity(coordinator, device, room))
+                devices.append(TimeToTargetSensorEntity(coordinator, device, room))
+                devices.append(
+                    AverageTemperatureSensorEntity(coordinator, device, room)
+                )
 
     for device in devices:
         _LOGGER.info(f"Adding {device}")
@@ -121,3 +134,80 @@ class HumidityTemperatureSensorEntity(CoordinatorEntity, SensorEntity):
         """Update state from coordinator data."""
         device: HumiditySensor = self.room.devices[self.sensor.identifier]
         self._attr_native_value = device.current_env_temp
+
+
+class TelemetrySensorEntity(CoordinatorEntity, SensorEntity):
+    """Base for sensors derived from the coordinator's telemetry buffers."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    stat: str
+    suffix: str
+    label: str
+
+    def __init__(self, coordinator, device: Device, room: Room):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.device = device
+        self._attr_unique_id = f"{device.identifier}_{self.suffix}"
+        self._attr_name = f"{self.device.name} {self.label} ({room.name})"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, device.identifier)},
+            "name": self.device.name,
+            "manufacturer": self.device.manufacturer,
+        }
+        self._update_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_state()
+        self.async_write_ha_state()
+
+    def _update_state(self):
+        """Update state from coordinator telemetry."""
+        stats = self.coordinator.telemetry.stats.get(self.device.identifier)
+        self._attr_native_value = getattr(stats, self.stat) if stats else None
+
+
+class TemperatureTrendSensorEntity(TelemetrySensorEntity):
+    """Rate of change of a device's temperature."""
+
+    _attr_native_unit_of_measurement = f"{UnitOfTemperature.CELSIUS}/h"
+
+    stat = "temperature_trend"
+    suffix = "temperature_trend"
+    label = "Temperature Trend"
+
+
+class TimeToTargetSensorEntity(TelemetrySensorEntity):
+    """Estimated time until a device's temperature reaches its setpoint."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    stat = "time_to_target"
+    suffix = "time_to_target"
+    label = "Time To Target"
+
+
+class AverageTemperatureSensorEntity(TelemetrySensorEntity):
+    """Rolling average of a device's temperature."""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+
+    stat = "average_temperature"
+    suffix = "average_temperature"
+    label = "Average Temperature"
+
+
+class AverageHumiditySensorEntity(TelemetrySensorEntity):
+    """Rolling average of a device's humidity."""
+
+    _attr_device_class = SensorDeviceClass.HUMIDITY
+    _attr_native_unit_of_measurement = PERCENTAGE
+
+    stat = "average_humidity"
+    suffix = "average_humidity"
+    label = "Average Humidity"
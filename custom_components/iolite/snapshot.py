@@ -0,0 +1,59 @@
+"""Whole-house snapshots of IOLITE data."""
+
+from typing import Any, Dict
+
+from iolite_client.entity import Room
+
+SNAPSHOT_ROOMS = "rooms"
+SNAPSHOT_DEVICES = "devices"
+
+
+def build_snapshot(rooms: Dict[str, Room]) -> Dict[str, Dict[str, dict]]:
+    """Build a plain snapshot of the given rooms and their devices."""
+    snapshot: Dict[str, Dict[str, dict]] = {SNAPSHOT_ROOMS: {}, SNAPSHOT_DEVICES: {}}
+    for room in rooms.values():
+        room_snapshot: Dict[str, Any] = {"name": room.name}
+        if room.heating:
+            room_snapshot["current_temp"] = room.heating.current_temp
+            room_snapshot["target_temp"] = room.heating.target_temp
+            room_snapshot["window_open"] = room.heating.window_open
+        snapshot[SNAPSHOT_ROOMS][room.identifier] = room_snapshot
+
+        for device in room.devices.values():
+            device_snapshot = {
+                key: value for key, value in vars(device).items() if key != "identifier"
+            }
+            device_snapshot["type"] = device.get_type()
+            snapshot[SNAPSHOT_DEVICES][device.identifier] = device_snapshot
+
+    return snapshot
+
+
+def diff_snapshots(
+    previous: Dict[str, Dict[str, dict]], current: Dict[str, Dict[str, dict]]
+) -> Dict[str, Dict[str, dict]]:
+    """Return only the properties that changed between two snapshots.
+
+    Rooms or devices that disappeared are reported with a ``None`` value.
+    """
+    changes: Dict[str, Dict[str, dict]] = {}
+    for section in (SNAPSHOT_ROOMS, SNAPSHOT_DEVICES):
+        section_changes: Dict[str, Any] = {}
+        old_items = previous.get(section, {})
+        new_items = current.get(section, {})
+
+        for identifier, new in new_items.items():
+            old = old_items.get(identifier, {})
+            changed = {
+                key: value for key, value in new.items() if old.get(key) != value
+            }
+            if changed:
+                section_changes[identifier] = changed
+
+        for identifier in old_items.keys() - new_items.keys():
+            section_changes[identifier] = None
+
+        if section_changes:
+            changes[section] = section_changes
+
+    return changes
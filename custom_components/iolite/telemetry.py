@@ -0,0 +1,195 @@
+"""In-memory telemetry for IOLITE devices."""
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from iolite_client.entity import Device, InFloorValve, Room
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_MINUTE = 60
+
+
+class TelemetryBuffer:
+    """Fixed-size, array-backed ring buffer of samples for a single device."""
+
+    def __init__(self, size: int):
+        """Initialize the buffer."""
+        self.size = size
+        self.timestamps = array("d", [math.nan] * size)
+        self.temperatures = array("d", [math.nan] * size)
+        self.humidities = array("d", [math.nan] * size)
+        self.setpoints = array("d", [math.nan] * size)
+        self.head = 0
+        self.count = 0
+
+    def append(
+        self,
+        timestamp: float,
+        temperature: Optional[float],
+        humidity: Optional[float],
+        setpoint: Optional[float],
+    ):
+        """Append a sample, overwriting the oldest one when full."""
+        self.timestamps[self.head] = timestamp
+        self.temperatures[self.head] = _to_float(temperature)
+        self.humidities[self.head] = _to_float(humidity)
+        self.setpoints[self.head] = _to_float(setpoint)
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def latest(self, values: array) -> float:
+        """Return the most recent value of the given series."""
+        if not self.count:
+            return math.nan
+
+        return values[(self.head - 1) % self.size]
+
+
+class TelemetryStats:
+    """Values derived from a device's telemetry buffer."""
+
+    def __init__(
+        self,
+        temperature_trend: Optional[float],
+        time_to_target: Optional[float],
+        average_temperature: Optional[float],
+        average_humidity: Optional[float],
+    ):
+        """Initialize the stats."""
+        self.temperature_trend = temperature_trend
+        self.time_to_target = time_to_target
+        self.average_temperature = average_temperature
+        self.average_humidity = average_humidity
+
+
+class TelemetryStore:
+    """Keeps a telemetry buffer per device and derives stats for all of them."""
+
+    def __init__(self, size: int):
+        """Initialize the store."""
+        self.size = size
+        self.buffers: Dict[str, TelemetryBuffer] = {}
+        self.stats: Dict[str, TelemetryStats] = {}
+
+    def record(self, rooms: Iterable[Room], timestamp: float):
+        """Record a sample for every device with telemetry in the given rooms.
+
+        A missing reading is recorded as NaN. Buffers are only dropped for
+        devices that are no longer present in the rooms.
+        """
+        present = set()
+        for room in rooms:
+            for device in room.devices.values():
+                present.add(device.identifier)
+                if not hasattr(device, "current_env_temp"):
+                    continue
+
+                buffer = self.buffers.get(device.identifier)
+                if buffer is None:
+                    buffer = TelemetryBuffer(self.size)
+                    self.buffers[device.identifier] = buffer
+
+                buffer.append(
+                    timestamp,
+                    device.current_env_temp,
+                    getattr(device, "humidity_level", None),
+                    _get_setpoint(device, room),
+                )
+
+        for identifier in self.buffers.keys() - present:
+            self.buffers.pop(identifier)
+
+    def compute(self) -> Dict[str, TelemetryStats]:
+        """Derive stats for every device from its buffer."""
+        self.stats = {
+            identifier: _compute_stats(buffer)
+            for identifier, buffer in self.buffers.items()
+        }
+
+        return self.stats
+
+
+def _get_setpoint(device: Device, room: Room) -> Optional[float]:
+    if isinstance(device, InFloorValve):
+        return device.heating_temperature_setting
+
+    if room.heating:
+        return room.heating.target_temp
+
+    return None
+
+
+def _compute_stats(buffer: TelemetryBuffer) -> TelemetryStats:
+    average_temperature = _mean(buffer.temperatures)
+    trend = _slope(buffer.timestamps, buffer.temperatures)
+
+    temperature_trend = None
+    time_to_target = None
+    if trend is not None:
+        temperature_trend = round(trend * SECONDS_PER_HOUR, 2)
+        time_to_target = _time_to_target(
+            buffer.latest(buffer.temperatures), buffer.latest(buffer.setpoints), trend
+        )
+
+    return TelemetryStats(
+        temperature_trend,
+        time_to_target,
+        _round(average_temperature),
+        _round(_mean(buffer.humidities)),
+    )
+
+
+def _time_to_target(current: float, target: float, trend: float) -> Optional[float]:
+    """Return the minutes until the target is reached at the current trend."""
+    if math.isnan(current) or math.isnan(target):
+        return None
+
+    delta = target - current
+    if delta == 0:
+        return 0.0
+
+    if trend == 0 or (delta > 0) != (trend > 0):
+        return None
+
+    return round(delta / trend / SECONDS_PER_MINUTE, 1)
+
+
+def _mean(values: array) -> Optional[float]:
+    samples = _valid(values)
+    if not samples:
+        return None
+
+    return math.fsum(samples) / len(samples)
+
+
+def _slope(timestamps: array, values: array) -> Optional[float]:
+    """Least-squares slope of values over time, in units per second."""
+    pairs = [
+        (timestamp, value)
+        for timestamp, value in zip(timestamps, values)
+        if not math.isnan(timestamp) and not math.isnan(value)
+    ]
+    if len(pairs) < 2:
+        return None
+
+    mean_t = math.fsum(t for t, _ in pairs) / len(pairs)
+    mean_v = math.fsum(v for _, v in pairs) / len(pairs)
+    covariance = math.fsum((t - mean_t) * (v - mean_v) for t, v in pairs)
+    variance = math.fsum((t - mean_t) ** 2 for t, _ in pairs)
+    if variance == 0:
+        return None
+
+    return covariance / variance
+
+
+def _valid(values: array) -> List[float]:
+    return [value for value in values if not math.isnan(value)]
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+def _to_float(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
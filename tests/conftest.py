@@ -1,7 +1,27 @@
+import ssl
+
 import pytest
+from homeassistant.util.async_ import protect_loop
 
 
 @pytest.fixture(autouse=True)
 def auto_enable_custom_integrations(enable_custom_integrations):
     """Enable custom integrations defined in the test dir."""
     yield
+
+
+@pytest.fixture
+def block_ssl_setup(monkeypatch: pytest.MonkeyPatch):
+    """Fail when SSL contexts are set up inside the event loop."""
+    monkeypatch.setattr(
+        ssl, "create_default_context", protect_loop(ssl.create_default_context)
+    )
+    for name in (
+        "load_cert_chain",
+        "load_default_certs",
+        "load_verify_locations",
+        "set_default_verify_paths",
+    ):
+        monkeypatch.setattr(
+            ssl.SSLContext, name, protect_loop(getattr(ssl.SSLContext, name))
+        )
@@ -4,8 +4,9 @@ import pytest
 import voluptuous
 from homeassistant import data_entry_flow
 from homeassistant.config_entries import SOURCE_USER
-from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_VERIFY_SSL
 from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.iolite import DOMAIN
 
@@ -38,3 +39,23 @@ async def test_flow_invalid_scan_interval_range(
         await hass.config_entries.flow.async_configure(
             result["flow_id"], user_input={CONF_SCAN_INTERVAL: 125}
         )
+
+
+async def test_options_flow_defaults_to_current_settings(hass: HomeAssistant) -> None:
+    """Test that the options form is prefilled with the current settings."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_SCAN_INTERVAL: 30, CONF_VERIFY_SSL: False}
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+
+    defaults = {str(key): key.default() for key in result["data_schema"].schema.keys()}
+    assert defaults == {CONF_SCAN_INTERVAL: 30, CONF_VERIFY_SSL: False}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_SCAN_INTERVAL: 90, CONF_VERIFY_SSL: True}
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options == {CONF_SCAN_INTERVAL: 90, CONF_VERIFY_SSL: True}
@@ -0,0 +1,340 @@
+import asyncio
+import tracemalloc
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    CONF_CLIENT_ID,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from iolite_client.entity import Heating, HumiditySensor, RadiatorValve, Room
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.iolite import DOMAIN
+
+
+def _create_rooms(humidity: float = 50.0) -> list:
+    room = Room("room-1", "Living Room")
+    room.add_device(
+        RadiatorValve("valve-1", "Valve", "room-1", "Manufacturer", 20.0, 80, "", 0)
+    )
+    room.add_device(
+        HumiditySensor("sensor-1", "Sensor", "room-1", "Manufacturer", 20.0, humidity)
+    )
+    room.add_heating(Heating("room-1", "Living Room", 20.0, 21.0, False))
+    return [room]
+
+
+@pytest.fixture
+def mock_client():
+    """Mock the IOLITE client and authentication."""
+    with patch("custom_components.iolite.get_sid", return_value="sid"), patch(
+        "custom_components.iolite.IoliteClient"
+    ) as client_class:
+        client = client_class.return_value
+        client.async_discover = AsyncMock()
+        client.discovered = Mock()
+        client.discovered.get_rooms.side_effect = _create_rooms
+        yield client_class
+
+
+async def _setup_entry(hass: HomeAssistant, username: str = "user") -> MockConfigEntry:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: username,
+            CONF_PASSWORD: "pass",
+            CONF_CLIENT_ID: "client",
+            CONF_SCAN_INTERVAL: 30,
+        },
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+async def test_setup_entry(hass: HomeAssistant, mock_client: Mock) -> None:
+    """Test that entities are created from the discovered rooms."""
+    entry = await _setup_entry(hass)
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("climate.valve_living_room").attributes["temperature"] == 21
+    assert hass.states.get("sensor.sensor_humidity_living_room").state == "50.0"
+
+
+async def test_refresh_service(hass: HomeAssistant, mock_client: Mock) -> None:
+    """Test that the refresh service refreshes every entry immediately."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.scheduler.min_spacing = 0
+    client = mock_client.return_value
+    assert client.async_discover.await_count == 1
+
+    await hass.services.async_call(DOMAIN, "refresh", {}, blocking=True)
+    await hass.async_block_till_done()
+
+    assert client.async_discover.await_count == 2
+
+
+async def test_get_snapshot_service(hass: HomeAssistant, mock_client: Mock) -> None:
+    """Test that the snapshot of every entry is returned in one response."""
+    entry = await _setup_entry(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN, "get_snapshot", {}, blocking=True, return_response=True
+    )
+
+    snapshot = response["entries"][entry.entry_id]
+    assert snapshot["rooms"]["room-1"]["target_temp"] == 21.0
+    assert snapshot["devices"]["sensor-1"]["humidity_level"] == 50.0
+    assert snapshot["age"] is not None
+
+
+async def test_changes_event(hass: HomeAssistant, mock_client: Mock) -> None:
+    """Test that changes are fired once entity states are updated."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.scheduler.min_spacing = 0
+
+    events = []
+
+    @callback
+    def capture(event: Event) -> None:
+        state = hass.states.get("sensor.sensor_humidity_living_room")
+        events.append((event.data, state.state))
+
+    hass.bus.async_listen("iolite_changes", capture)
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert events == []
+
+    client = mock_client.return_value
+    client.discovered.get_rooms.side_effect = lambda: _create_rooms(55.0)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert events == [
+        (
+            {
+                "entry_id": entry.entry_id,
+                "devices": {"sensor-1": {"humidity_level": 55.0}},
+            },
+            "55.0",
+        )
+    ]
+
+
+async def test_options_are_applied_without_reload(
+    hass: HomeAssistant, mock_client: Mock
+) -> None:
+    """Test that option changes update the running coordinator."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    account = coordinator.account
+    transport = coordinator.transport
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_SCAN_INTERVAL: 90, CONF_VERIFY_SSL: True}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert coordinator.update_interval == timedelta(seconds=90)
+    assert coordinator.transport is transport
+
+    coordinator.scheduler.min_spacing = 0
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_SCAN_INTERVAL: 90, CONF_VERIFY_SSL: False}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert coordinator.verify_ssl is False
+    assert coordinator.account is account
+    assert coordinator.transport is not transport
+    assert coordinator.transport.oauth_handler.verify_ssl is False
+
+
+async def test_set_temperature_uses_current_client(
+    hass: HomeAssistant, mock_client: Mock
+) -> None:
+    """Test that entities use the client rebuilt after an options change."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.scheduler.min_spacing = 0
+    first = coordinator.client
+
+    second = Mock()
+    second.async_discover = AsyncMock()
+    second.async_set_property = AsyncMock()
+    second.discovered.get_rooms.side_effect = _create_rooms
+    mock_client.return_value = second
+
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_SCAN_INTERVAL: 30, CONF_VERIFY_SSL: False}
+    )
+    await hass.async_block_till_done()
+    assert coordinator.client is second
+
+    await hass.services.async_call(
+        "climate",
+        "set_temperature",
+        {"entity_id": "climate.valve_living_room", "temperature": 22},
+        blocking=True,
+    )
+
+    second.async_set_property.assert_awaited_once_with(
+        "valve-1", "heatingTemperatureSetting", 22
+    )
+    first.async_set_property.assert_not_called()
+
+
+class FakeWebsocket:
+    """Websocket connection without any responses."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def send(self, request):
+        return None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+async def test_refresh_does_not_block_event_loop(
+    hass: HomeAssistant, block_ssl_setup: None
+) -> None:
+    """Test that refreshes reuse the account's SSL context."""
+    with patch("custom_components.iolite.get_sid", return_value="sid"), patch(
+        "custom_components.iolite.client.websockets.connect",
+        side_effect=lambda *args, **kwargs: FakeWebsocket(),
+    ) as connect:
+        entry = await _setup_entry(hass)
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        coordinator.scheduler.min_spacing = 0
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert connect.call_count == 4
+    for call in connect.call_args_list:
+        assert call.kwargs["ssl"] is coordinator.transport.ssl_context
+
+
+async def test_start_profiling_writes_report(
+    hass: HomeAssistant, mock_client: Mock, tmp_path
+) -> None:
+    """Test that the profiled refreshes are written to the config directory."""
+    hass.config.config_dir = str(tmp_path)
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.scheduler.min_spacing = 0
+
+    await hass.services.async_call(
+        DOMAIN, "start_profiling", {"refreshes": 2}, blocking=True
+    )
+    await coordinator.async_refresh()
+    assert not list(tmp_path.glob("iolite_profile_*.txt"))
+    assert not tracemalloc.is_tracing()
+
+    await coordinator.async_refresh()
+    assert coordinator.profiler is None
+
+    [report] = tmp_path.glob(f"iolite_profile_{entry.entry_id}_*.txt")
+    content = report.read_text()
+    assert "async_discover: count=2" in content
+    assert "update_listeners: count=2" in content
+    assert "_async_update_data" in content
+    assert "Memory allocations" in content
+
+
+async def test_start_profiling_targets_one_entry(
+    hass: HomeAssistant, mock_client: Mock
+) -> None:
+    """Test that profiling is armed for a single entry only."""
+    first = await _setup_entry(hass, "first")
+    hass.data[DOMAIN]["scheduler"].min_spacing = 0
+    second = await _setup_entry(hass, "second")
+
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(DOMAIN, "start_profiling", {}, blocking=True)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "start_profiling",
+        {"config_entry_id": second.entry_id},
+        blocking=True,
+    )
+
+    assert hass.data[DOMAIN][first.entry_id].profiler is None
+    assert hass.data[DOMAIN][second.entry_id].profiler is not None
+
+
+async def test_overlapping_profiled_refreshes(
+    hass: HomeAssistant, mock_client: Mock, tmp_path
+) -> None:
+    """Test that overlapping refreshes of two entries are profiled in turn."""
+    hass.config.config_dir = str(tmp_path)
+    entries = [await _setup_entry(hass, "first")]
+    hass.data[DOMAIN]["scheduler"].min_spacing = 0
+    entries.append(await _setup_entry(hass, "second"))
+    coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+
+    async def slow_discover():
+        await asyncio.sleep(0.01)
+
+    mock_client.return_value.async_discover.side_effect = slow_discover
+    for entry in entries:
+        await hass.services.async_call(
+            DOMAIN,
+            "start_profiling",
+            {"config_entry_id": entry.entry_id},
+            blocking=True,
+        )
+
+    await asyncio.gather(*(c.async_refresh() for c in coordinators))
+    assert len(list(tmp_path.glob("iolite_profile_*.txt"))) == 1
+    assert [c.profiler is None for c in coordinators].count(True) == 1
+
+    await asyncio.gather(*(c.async_refresh() for c in coordinators))
+    assert len(list(tmp_path.glob("iolite_profile_*.txt"))) == 2
+
+    for coordinator in coordinators:
+        assert coordinator.profiler is None
+        assert coordinator.last_update_success
+    assert not tracemalloc.is_tracing()
+
+
+async def test_profiler_failure_disarms_profiling(
+    hass: HomeAssistant, mock_client: Mock
+) -> None:
+    """Test that a failing profiler does not break refreshes."""
+    entry = await _setup_entry(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.scheduler.min_spacing = 0
+    await hass.services.async_call(DOMAIN, "start_profiling", {}, blocking=True)
+
+    with patch(
+        "custom_components.iolite.profiler.cProfile.Profile.enable",
+        side_effect=ValueError("Another profiling tool is already active"),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.profiler is None
+    assert coordinator.last_update_success
+    assert mock_client.return_value.async_discover.await_count == 2
@@ -0,0 +1,35 @@
+import time
+from unittest.mock import Mock
+
+from custom_components.iolite.scheduler import IoliteScheduler
+
+
+async def test_accounts_are_shared_per_username() -> None:
+    """Test that entries of the same account share auth resources."""
+    scheduler = IoliteScheduler(60)
+
+    first = scheduler.async_get_account("a", "user", Mock())
+    second = scheduler.async_get_account("b", "user", Mock())
+    other = scheduler.async_get_account("c", "other", Mock())
+
+    assert first is second
+    assert first.storage is second.storage
+    assert first is not other
+
+    scheduler.async_release("a")
+    scheduler.async_release("c")
+    assert not scheduler.is_empty
+
+    scheduler.async_release("b")
+    assert scheduler.is_empty
+
+
+async def test_refreshes_are_spaced() -> None:
+    """Test that consecutive refreshes respect the request budget."""
+    scheduler = IoliteScheduler(600)
+
+    start = time.monotonic()
+    await scheduler.async_wait_for_slot("first")
+    await scheduler.async_wait_for_slot("second")
+
+    assert time.monotonic() - start >= scheduler.min_spacing
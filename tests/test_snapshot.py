@@ -0,0 +1,36 @@
+from iolite_client.entity import Heating, HumiditySensor, Room
+
+from custom_components.iolite.snapshot import build_snapshot, diff_snapshots
+
+
+def _create_rooms(humidity: float, target: float) -> dict:
+    room = Room("room-1", "Living Room")
+    room.add_device(
+        HumiditySensor("sensor-1", "Sensor", "room-1", "Manufacturer", 20.0, humidity)
+    )
+    room.add_heating(Heating("room-1", "Living Room", 20.0, target, False))
+    return {room.identifier: room}
+
+
+def test_build_snapshot() -> None:
+    """Test that rooms and devices are flattened into the snapshot."""
+    snapshot = build_snapshot(_create_rooms(50.0, 21.0))
+
+    assert snapshot["rooms"]["room-1"]["target_temp"] == 21.0
+    assert snapshot["devices"]["sensor-1"]["humidity_level"] == 50.0
+    assert snapshot["devices"]["sensor-1"]["type"] == "humiditysensor"
+
+
+def test_diff_snapshots_contains_only_changes() -> None:
+    """Test that only changed properties are reported."""
+    previous = build_snapshot(_create_rooms(50.0, 21.0))
+    current = build_snapshot(_create_rooms(55.0, 21.0))
+
+    assert diff_snapshots(previous, current) == {
+        "devices": {"sensor-1": {"humidity_level": 55.0}}
+    }
+    assert diff_snapshots(current, current) == {}
+    assert diff_snapshots(current, build_snapshot({})) == {
+        "rooms": {"room-1": None},
+        "devices": {"sensor-1": None},
+    }
@@ -0,0 +1,47 @@
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.iolite import HaOAuthStorageInterface
+from custom_components.iolite.const import STORAGE_KEY, STORAGE_VERSION
+
+
+async def test_tokens_are_stored_per_account(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that accounts do not overwrite each other's tokens."""
+    await HaOAuthStorageInterface(hass, "first@example.com").store_access_token(
+        {"access_token": "first"}
+    )
+    await HaOAuthStorageInterface(hass, "second@example.com").store_access_token(
+        {"access_token": "second"}
+    )
+
+    first = await HaOAuthStorageInterface(
+        hass, "first@example.com"
+    ).fetch_access_token()
+    second = await HaOAuthStorageInterface(
+        hass, "second@example.com"
+    ).fetch_access_token()
+
+    assert first == {"access_token": "first"}
+    assert second == {"access_token": "second"}
+
+
+async def test_legacy_token_is_migrated(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that a token stored under the legacy key is moved to the account."""
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "key": STORAGE_KEY,
+        "data": {"access_token": "legacy"},
+    }
+
+    storage = HaOAuthStorageInterface(hass, "user")
+
+    assert await storage.fetch_access_token() == {"access_token": "legacy"}
+    assert STORAGE_KEY not in hass_storage
+    assert await HaOAuthStorageInterface(hass, "user").fetch_access_token() == {
+        "access_token": "legacy"
+    }
@@ -0,0 +1,86 @@
+from iolite_client.entity import Heating, HumiditySensor, RadiatorValve, Room
+
+from custom_components.iolite.telemetry import TelemetryBuffer, TelemetryStore
+
+
+def _create_room(temperature: float, humidity: float, target: float) -> Room:
+    room = Room("room-1", "Living Room")
+    room.add_device(
+        RadiatorValve(
+            "valve-1", "Valve", "room-1", "Manufacturer", temperature, 80, "", 0
+        )
+    )
+    room.add_device(
+        HumiditySensor(
+            "sensor-1", "Sensor", "room-1", "Manufacturer", temperature, humidity
+        )
+    )
+    room.add_heating(Heating("room-1", "Living Room", temperature, target, False))
+    return room
+
+
+def test_buffer_overwrites_oldest_sample() -> None:
+    """Test that the ring buffer keeps only the most recent samples."""
+    buffer = TelemetryBuffer(2)
+    for timestamp in range(3):
+        buffer.append(timestamp, 20.0 + timestamp, None, None)
+
+    assert buffer.count == 2
+    assert sorted(buffer.temperatures) == [21.0, 22.0]
+    assert buffer.latest(buffer.temperatures) == 22.0
+
+
+def test_store_computes_stats() -> None:
+    """Test that trend, time to target and averages are derived per device."""
+    store = TelemetryStore(10)
+    for minute, temperature in enumerate([18.0, 18.5, 19.0]):
+        store.record([_create_room(temperature, 50.0 + minute, 21.0)], minute * 60)
+
+    stats = store.compute()
+
+    assert stats["valve-1"].temperature_trend == 30.0
+    assert stats["valve-1"].time_to_target == 4.0
+    assert stats["valve-1"].average_temperature == 18.5
+    assert stats["valve-1"].average_humidity is None
+    assert stats["sensor-1"].average_humidity == 51.0
+
+
+def test_store_time_to_target_moving_away() -> None:
+    """Test that no estimate is given when moving away from the target."""
+    store = TelemetryStore(10)
+    for minute, temperature in enumerate([20.0, 19.5]):
+        store.record([_create_room(temperature, 50.0, 21.0)], minute * 60)
+
+    assert store.compute()["valve-1"].time_to_target is None
+
+
+def test_store_drops_removed_devices() -> None:
+    """Test that buffers and stats of removed devices are dropped."""
+    store = TelemetryStore(10)
+    store.record([_create_room(20.0, 50.0, 21.0)], 0)
+    store.compute()
+
+    room = _create_room(20.0, 50.0, 21.0)
+    room.devices.pop("valve-1")
+    store.record([room], 60)
+
+    assert "valve-1" not in store.buffers
+    assert "valve-1" not in store.compute()
+    assert "sensor-1" in store.stats
+
+
+def test_store_keeps_buffer_without_reading() -> None:
+    """Test that a missing reading does not drop the device's history."""
+    store = TelemetryStore(10)
+    store.record([_create_room(20.0, 50.0, 21.0)], 0)
+    store.record([_create_room(20.5, 50.0, 21.0)], 60)
+
+    room = _create_room(20.0, 50.0, 21.0)
+    room.devices["valve-1"].current_env_temp = None
+    store.record([room], 120)
+
+    assert store.buffers["valve-1"].count == 3
+    stats = store.compute()["valve-1"]
+    assert stats.average_temperature == 20.25
+    assert stats.temperature_trend == 30.0
+    assert stats.time_to_target is None